@@ -2,12 +2,16 @@ from tkinter import *
 from tkinter import font
 from tkinter import messagebox
 from functools import partial
-from operator import attrgetter
 import webbrowser
+import heapq
+import itertools
+import collections
 import numpy
 import random
 import math
 import os
+import time
+import maze51_kernels
 
 """
 @author Nikos Kanargias
@@ -55,6 +59,36 @@ When 'Real-Time' search is underway the position of obstacles, robot and target
 Drawing of arrows to predecessors, when requested, is performed only at the end of the search.
 """
 
+# The colors of the cells, indexed by the values of the grid (EMPTY, OBST, ROBOT, TARGET, FRONTIER, CLOSED, ROUTE)
+_COLOR_TABLE = numpy.array(("WHITE", "BLACK", "RED", "GREEN", "BLUE", "CYAN", "YELLOW"))
+# The offsets (dx, dy) of the cells that could potentially be neighbors of a cell of MyMaze
+_MAZE_OFFSETS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+# The length of a diagonal move, the only step whose length is not 1
+_SQRT2 = math.sqrt(2)
+# The offsets (row, column) of the neighbors of a cell of the grid, in the priority order of the successors
+_OFFSETS4 = ((-1, 0), (0, 1), (1, 0), (0, -1))
+_OFFSETS8 = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+# The sines and cosines of the angles that give the directions of the tips of the arrows
+_SIN20 = math.sin(20*math.pi/180)
+_COS20 = math.cos(20*math.pi/180)
+_SIN25 = math.sin(25*math.pi/180)
+_COS25 = math.cos(25*math.pi/180)
+# The offsets (du3, dv3, du4, dv4) of the ends of the two tips of an arrow of unit size from its head,
+# indexed by the signs (dx, dy) of the direction of the arrow
+_ARROW_TIPS = {
+    (0, -1): (-_SIN20, _COS20, _SIN20, _COS20),     # up
+    (1, -1): (-_COS25, _SIN25, -_SIN25, _COS25),    # up-right
+    (1, 0): (-_COS20, -_SIN20, -_COS20, _SIN20),    # right
+    (1, 1): (-_COS25, -_SIN25, -_SIN25, -_COS25),   # right-down
+    (0, 1): (-_SIN20, -_COS20, _SIN20, -_COS20),    # down
+    (-1, 1): (_SIN25, -_COS25, _COS25, -_SIN25),    # left-down
+    (-1, 0): (_COS20, -_SIN20, _COS20, _SIN20),     # left
+    (-1, -1): (_SIN25, _COS25, _COS25, _SIN25),     # left-up
+    (0, 0): (0.0, 0.0, 0.0, 0.0),
+}
+# The same offsets as an array, indexed by [dx + 1, dy + 1]
+_ARROW_TIP_TABLE = numpy.array([[_ARROW_TIPS[(dx, dy)] for dy in (-1, 0, 1)] for dx in (-1, 0, 1)])
+
 
 class Maze51:
 
@@ -124,98 +158,90 @@ class Maze51:
             self.gridDimensionX = x_dimension * 2 + 1  # dimension of output grid
             self.gridDimensionY = y_dimension * 2 + 1
             # output grid
-            self.mazeGrid = [[' ' for y in range(self.gridDimensionY)] for x in range(self.gridDimensionX)]
-            # 2d array of Cells
-            self.cells = [[self.Cell(x, y, False) for y in range(self.dimensionY)] for x in range(self.dimensionX)]
-            self.generate_maze()
+            self.mazeGrid = numpy.full((self.gridDimensionX, self.gridDimensionY), ' ', dtype='U1')
+            # The cells are stored as arrays of their attributes, indexed by the coordinates x, y.
+            # if true, the cell is connected to the cell below it (x, y + 1)
+            self.connect_down = numpy.zeros((self.dimensionX, self.dimensionY), dtype=bool)
+            # if true, the cell is connected to the cell at its right (x + 1, y)
+            self.connect_right = numpy.zeros((self.dimensionX, self.dimensionY), dtype=bool)
+            # if true, the cell has yet to be used in generation
+            self.open = numpy.ones((self.dimensionX, self.dimensionY), dtype=bool)
+            if maze51_kernels.HAVE_NUMBA:
+                # the seed is drawn from the random module, so that random.seed() still reproduces a maze
+                maze51_kernels.generate_maze(self.open, self.connect_down, self.connect_right,
+                                             random.randrange(2 ** 31))
+            else:
+                self.generate_maze()
             self.update_grid()
 
-        class Cell(object):
-            """
-            inner class to represent a cell
-            """
-            def __init__(self, x, y, is_wall=True):
-                self.neighbors = []  # cells this cell is connected to
-                self.open = True     # if true, has yet to be used in generation
-                self.x = x           # coordinates
-                self.y = y
-                self.wall = is_wall  # impassable cell
-
-            def add_neighbor(self, other):
-                """
-                add a neighbor to this cell, and this cell as a neighbor to the other
-                """
-                if other not in self.neighbors:  # avoid duplicates
-                    self.neighbors.append(other)
-                if self not in other.neighbors:  # avoid duplicates
-                    other.neighbors.append(self)
-
-            def is_cell_below_neighbor(self):
-                """
-                used in update_grid()
-                """
-                return self.__class__(self.x, self.y + 1) in self.neighbors
-
-            def is_cell_right_neighbor(self):
-                """
-                used in update_grid()
-                """
-                return self.__class__(self.x + 1, self.y) in self.neighbors
-
-            def __eq__(self, other):
-                """
-                useful Cell equivalence
-                """
-                if isinstance(other, self.__class__):
-                    return self.x == other.x and self.y == other.y
-                else:
-                    return False
-
         def generate_maze(self):
             """
             generate the maze from upper left (In computing the y increases down often)
             """
+            dimension_x = self.dimensionX
+            dimension_y = self.dimensionY
+            is_open = self.open
+            # Every cell but the first is pushed twice and every push is popped once,
+            # so the loop below runs exactly 2*X*Y - 1 times: all its random numbers
+            # are drawn at once (the seed is drawn from the random module, so that
+            # random.seed() still reproduces a maze).
+            steps = 2 * dimension_x * dimension_y - 1
+            rng = numpy.random.default_rng(random.randrange(2 ** 31))
+            reshuffle = (rng.random(steps) < 0.1).tolist()
+            picks = rng.random(steps).tolist()
+            choices = rng.random(steps).tolist()
+            # the random numbers of each pass of the loop
+            draws = zip(reshuffle, picks, choices)
             start_at = self.get_cell(0, 0)
-            start_at.open = False  # indicate cell closed for generation
+            self.open[start_at] = False  # indicate cell closed for generation
             cells = [start_at]
             while cells:
+                shuffle, pick, choice = next(draws)
                 # this is to reduce but not completely eliminate the number
                 # of long twisting halls with short easy to detect branches
                 # which results in easy mazes
-                if random.randint(0, 9) == 0:
-                    cell = cells.pop(random.randint(0, cells.__len__()) - 1)
-                else:
-                    cell = cells.pop(cells.__len__() - 1)
+                if shuffle:
+                    # swap a random cell with the last one, so that pop() does not shift the list
+                    i = int(pick * len(cells))
+                    cells[i], cells[-1] = cells[-1], cells[i]
+                cell = cells.pop()
+                x, y = cell
                 # for collection
                 neighbors = []
                 # cells that could potentially be neighbors
-                potential_neighbors = [self.get_cell(cell.x + 1, cell.y), self.get_cell(cell.x, cell.y + 1),
-                                       self.get_cell(cell.x - 1, cell.y), self.get_cell(cell.x, cell.y - 1)]
-                for other in potential_neighbors:
-                    # skip if outside, is a wall or is not opened
-                    if other is None or other.wall or not other.open:
-                        continue
-                    neighbors.append(other)
+                for dx, dy in _MAZE_OFFSETS:
+                    other_x = x + dx
+                    other_y = y + dy
+                    # skip if outside or is not opened
+                    if 0 <= other_x < dimension_x and 0 <= other_y < dimension_y and is_open[other_x, other_y]:
+                        neighbors.append((other_x, other_y))
                 if not neighbors:
                     continue
                 # get random cell
-                selected = neighbors[random.randint(0, neighbors.__len__()) - 1]
+                selected = neighbors[int(choice * len(neighbors))]
                 # add as neighbor
-                selected.open = False  # indicate cell closed for generation
-                cell.add_neighbor(selected)
+                self.open[selected] = False  # indicate cell closed for generation
+                self.add_neighbor(cell, selected)
                 cells.append(cell)
                 cells.append(selected)
 
+        def add_neighbor(self, cell, other):
+            """
+            connect two adjacent cells; the connection is kept by the upper left one of them
+            """
+            (x, y), (other_x, other_y) = sorted((cell, other))
+            if x == other_x:
+                self.connect_down[x, y] = True
+            else:
+                self.connect_right[x, y] = True
+
         def get_cell(self, x, y):
             """
-            used to get a Cell at x, y; returns None out of bounds
+            used to get the coordinates of a cell at x, y; returns None out of bounds
             """
-            if x < 0 or y < 0:
-                return None
-            try:
-                return self.cells[x][y]
-            except IndexError:  # catch out of bounds
-                return None
+            if 0 <= x < self.dimensionX and 0 <= y < self.dimensionY:
+                return x, y
+            return None
 
         def update_grid(self):
             """
@@ -225,30 +251,22 @@ class Maze51:
             wall_char = 'X'
             cell_char = ' '
             # fill background
-            for x in range(self.gridDimensionX):
-                for y in range(self.gridDimensionY):
-                    self.mazeGrid[x][y] = back_char
+            self.mazeGrid.fill(back_char)
             # build walls
-            for x in range(self.gridDimensionX):
-                for y in range(self.gridDimensionY):
-                    if x % 2 == 0 or y % 2 == 0:
-                        self.mazeGrid[x][y] = wall_char
+            self.mazeGrid[::2, :] = wall_char
+            self.mazeGrid[:, ::2] = wall_char
             # make meaningful representation
-            for x in range(self.dimensionX):
-                for y in range(self.dimensionY):
-                    current = self.get_cell(x, y)
-                    grid_x = x * 2 + 1
-                    grid_y = y * 2 + 1
-                    self.mazeGrid[grid_x][grid_y] = cell_char
-                    if current.is_cell_below_neighbor():
-                        self.mazeGrid[grid_x][grid_y + 1] = cell_char
-                    if current.is_cell_right_neighbor():
-                        self.mazeGrid[grid_x + 1][grid_y] = cell_char
+            self.mazeGrid[1::2, 1::2] = cell_char
+            self.mazeGrid[1::2, 2::2][self.connect_down] = cell_char
+            self.mazeGrid[2::2, 1::2][self.connect_right] = cell_char
 
     class Cell(object):
         """
         Helper class that represents the cell of the grid
         """
+        # Cells are created for every successor of every expansion; without an instance
+        # dictionary they take less memory and their attributes are accessed faster.
+        __slots__ = ("row", "col", "g", "h", "f", "dist", "prev")
 
         def __init__(self, row, col):
             self.row = row  # the row number of the cell(row 0 is the top)
@@ -273,12 +291,18 @@ class Maze51:
             else:
                 return False
 
+        def __hash__(self):
+            """
+            hash consistent with the Cell equivalence
+            """
+            return hash((self.row, self.col))
+
     #######################################
     #                                     #
     #      Constants of Maze42 class      #
     #                                     #
     #######################################
-    INFINITY = sys.maxsize  # The representation of the infinite
+    INFINITY = math.inf  # The representation of the infinite
     EMPTY = 0       # empty cell
     OBST = 1        # cell with obstacle
     ROBOT = 2       # the position of the robot
@@ -287,6 +311,16 @@ class Maze51:
     CLOSED = 5      # cells that form the CLOSED SET
     ROUTE = 6       # cells that form the robot-to-target path
 
+    # The search algorithms, as small integers, so that the search loop compares numbers instead of strings
+    ALGO_DFS = 0
+    ALGO_BFS = 1
+    ALGO_ASTAR = 2
+    ALGO_GREEDY = 3
+    ALGO_DIJKSTRA = 4
+    ALGO_IDS = {"DFS": ALGO_DFS, "BFS": ALGO_BFS, "A*": ALGO_ASTAR, "Greedy": ALGO_GREEDY, "Dijkstra": ALGO_DIJKSTRA}
+
+    REAL_TIME_BATCH = 64  # the number of steps of a real-time search performed between two redraws
+
     MSG_DRAW_AND_SELECT = "\"Paint\" obstacles, then click 'Real-Time' or 'Step-by-Step' or 'Animation'"
     MSG_SELECT_STEP_BY_STEP_ETC = "Click 'Step-by-Step' or 'Animation' or 'Clear'"
     MSG_NO_SOLUTION = "There is no path to the target !!!"
@@ -303,23 +337,40 @@ class Maze51:
         self.arrow_size = int(self.square_size/2)  # the size of the tips of the arrow pointing the predecessor cell
 
         self.openSet = []    # the OPEN SET
+        # the OPEN SET of A* and Greedy, as a heap of (f, insertion order, cell) entries
+        # and the current cell of each position; entries of replaced cells are skipped when popped.
+        # Dijkstra's algorithm keeps its queue Q in the same heap, as (dist, insertion order, vertex) entries.
+        self.open_heap = []
+        self.open_counter = itertools.count()
+        self.openMap = {}
         self.closedSet = []  # the CLOSED SET
-        self.graph = []      # the set of vertices of the graph to be explored by Dijkstra's algorithm
+        self.closedMap = {}  # the cell of the CLOSED SET at each position
 
         self.robotStart = self.Cell(self.rows - 2, 1)    # the initial position of the robot
         self.targetPos = self.Cell(1, self.columns - 2)  # the position of the target
 
         self.grid = [[]]            # the grid
+        self.flat_grid = []         # the grid as a flat array, indexed by row * columns + col
+        self.cell_items = [[]]      # the canvas rectangles of the cells of the grid
+        self.prev_grid = [[]]       # the values of the grid the cells were last painted with
+        self.dirty = []             # the cells changed by the current search step, painted at its end
         self.realTime = False       # Solution is displayed instantly
+        self.real_time_job = None   # the scheduled batch of real-time search steps
+        self.controls_enabled = False  # flag that all the buttons and the other controls are enabled
         self.found = False          # flag that the goal was found
         self.searching = False      # flag that the search is in progress
         self.endOfSearch = False    # flag that the search came to an end
         self.animation = False      # flag that the animation is running
         self.delay = 500            # time delay of animation (in msec)
+        self.next_step_time = 0.0   # the time (of the monotonic clock) the next step of the animation is due
         self.expanded = 0           # the number of nodes that have been expanded
         self.selected_algo = "DFS"  # DFS is initially selected
+        self.algo_id = self.ALGO_DFS  # the integer id of the selected algorithm
+        # the "Diagonal movements" and "Arrows to predecessors" options, as read when the search started
+        self.diagonal_moves = False
+        self.draw_arrows_on = False
 
-        self.array = numpy.array([0] * (83 * 83))
+        self.array = numpy.zeros(83 * 83, dtype=numpy.int8)
         self.cur_row = self.cur_col = self.cur_val = 0
         app_highlight_font = font.Font(app, family='Helvetica', size=10, weight='bold')
 
@@ -420,6 +471,13 @@ class Maze51:
         self.canvas = Canvas(app, bd=0, highlightthickness=0)
         self.canvas.bind("<Button-1>", self.left_click)
         self.canvas.bind("<B1-Motion>", self.drag)
+        # the '#rrggbb' form of the color names of the cells, as strings that Tk does not look up
+        self.rgb_colors = {}
+        for name in _COLOR_TABLE.tolist():
+            r, g, b = self.canvas.winfo_rgb(name)
+            self.rgb_colors[name] = "#{0:02x}{1:02x}{2:02x}".format(r >> 8, g >> 8, b >> 8)
+        # the colors of the cells, indexed by the values of the grid
+        self.cell_fills = numpy.array([self.rgb_colors[name] for name in _COLOR_TABLE.tolist()])
 
         self.initialize_grid(False)
 
@@ -487,27 +545,29 @@ class Maze51:
 
     def select_algo(self, algorithm):
         self.selected_algo = algorithm
+        self.algo_id = self.ALGO_IDS[algorithm]
 
     def left_click(self, event):
         """
         Handles clicks of left mouse button as we add or remove obstacles
         """
+        grid = self.grid
         row = int(event.y/self.square_size)
         col = int(event.x/self.square_size)
-        if row in range(self.rows) and col in range(self.columns):
+        if 0 <= row < self.rows and 0 <= col < self.columns:
             if True if self.realTime else (not self.found and not self.searching):
                 if self.realTime:
                     self.fill_grid()
                 self.cur_row = row
                 self.cur_col = col
-                self.cur_val = self.grid[row][col]
+                self.cur_val = grid[row, col]
                 if self.cur_val == self.EMPTY:
-                    self.grid[row][col] = self.OBST
+                    grid[row, col] = self.OBST
                     self.paint_cell(row, col, "BLACK")
                 if self.cur_val == self.OBST:
-                    self.grid[row][col] = self.EMPTY
+                    grid[row, col] = self.EMPTY
                     self.paint_cell(row, col, "WHITE")
-                if self.realTime and self.selected_algo == "Dijkstra":
+                if self.realTime and self.selected_algo == "Dijkstra" and not self.compiled_search_available():
                     self.initialize_dijkstra()
             if self.realTime:
                 self.real_Time_action()
@@ -516,38 +576,48 @@ class Maze51:
         """
         Handles mouse movements as we "paint" obstacles or move the robot and/or target.
         """
+        grid = self.grid
         row = int(event.y/self.square_size)
         col = int(event.x/self.square_size)
-        if row in range(self.rows) and col in range(self.columns):
+        if 0 <= row < self.rows and 0 <= col < self.columns:
+            # The mouse moves over many pixels of the same cell. In real-time mode a drag over an obstacle,
+            # the robot or the target leaves the grid as it is, so the search of the previous event
+            # is still valid.
+            if self.realTime and grid[row, col] in [self.OBST, self.ROBOT, self.TARGET]:
+                return
             if True if self.realTime else (not self.found and not self.searching):
                 if self.realTime:
                     self.fill_grid()
                 if self.Cell(row, col) != self.Cell(self.cur_row, self.cur_col) and\
                         self.cur_val in [self.ROBOT, self.TARGET]:
-                    new_val = self.grid[row][col]
+                    new_val = grid[row, col]
                     if new_val == self.EMPTY:
-                        self.grid[row][col] = self.cur_val
+                        grid[row, col] = self.cur_val
                         if self.cur_val == self.ROBOT:
-                            self.grid[self.robotStart.row][self.robotStart.col] = self.EMPTY
+                            grid[self.robotStart.row, self.robotStart.col] = self.EMPTY
                             self.paint_cell(self.robotStart.row, self.robotStart.col, "WHITE")
+                            # the robot is the only member of the OPEN SET
+                            self.in_open_mask[self.robotStart.row, self.robotStart.col] = 0
                             self.robotStart.row = row
                             self.robotStart.col = col
-                            self.grid[self.robotStart.row][self.robotStart.col] = self.ROBOT
+                            self.in_open_mask[row, col] = 1
+                            self.openMap = {(row, col): self.robotStart}
+                            grid[self.robotStart.row, self.robotStart.col] = self.ROBOT
                             self.paint_cell(self.robotStart.row, self.robotStart.col, "RED")
                         else:
-                            self.grid[self.targetPos.row][self.targetPos.col] = self.EMPTY
+                            grid[self.targetPos.row, self.targetPos.col] = self.EMPTY
                             self.paint_cell(self.targetPos.row, self.targetPos.col, "WHITE")
                             self.targetPos.row = row
                             self.targetPos.col = col
-                            self.grid[self.targetPos.row][self.targetPos.col] = self.TARGET
+                            grid[self.targetPos.row, self.targetPos.col] = self.TARGET
                             self.paint_cell(self.targetPos.row, self.targetPos.col, "GREEN")
                         self.cur_row = row
                         self.cur_col = col
-                        self.cur_val = self.grid[row][col]
-                elif self.grid[row][col] != self.ROBOT and self.grid[row][col] != self.TARGET:
-                    self.grid[row][col] = self.OBST
+                        self.cur_val = grid[row, col]
+                elif grid[row, col] != self.ROBOT and grid[row, col] != self.TARGET:
+                    grid[row, col] = self.OBST
                     self.paint_cell(row, col, "BLACK")
-                if self.realTime and self.selected_algo == "Dijkstra":
+                if self.realTime and self.selected_algo == "Dijkstra" and not self.compiled_search_available():
                     self.initialize_dijkstra()
             if self.realTime:
                 self.real_Time_action()
@@ -566,24 +636,40 @@ class Maze51:
             self.columns -= 1
         self.square_size = int(500/(self.rows if self.rows > self.columns else self.columns))
         self.arrow_size = int(self.square_size/2)
-        self.grid = self.array[:self.rows*self.columns]
-        self.grid = self.grid.reshape(self.rows, self.columns)
+        # Both are views of the same contiguous int8 storage
+        self.flat_grid = self.array[:self.rows*self.columns]
+        self.grid = self.flat_grid.reshape(self.rows, self.columns)
+        # the Euclidean distances between cells |dy| rows and |dx| columns apart, indexed by [|dy|, |dx|]
+        dy, dx = numpy.ogrid[:self.rows, :self.columns]
+        self.hyp = numpy.sqrt(dy * dy + dx * dx)
+        # the membership of the cells in the OPEN SET and in the CLOSED SET, as bitmaps
+        self.in_open_mask = numpy.zeros((self.rows, self.columns), dtype=numpy.uint8)
+        self.closed_mask = numpy.zeros((self.rows, self.columns), dtype=numpy.uint8)
+        # the labels 'dist' and 'previous' of Dijkstra's algorithm, indexed by the id row*columns + col
+        # of the cells; the predecessor of a cell is the id of the predecessor, -1 if undefined
+        self.dist = numpy.full(self.rows*self.columns, self.INFINITY)
+        self.prev = numpy.full(self.rows*self.columns, -1, dtype=numpy.int32)
         self.canvas.configure(width=self.columns*self.square_size+1, height=self.rows*self.square_size+1)
         self.canvas.place(x=10, y=10)
-        self.canvas.create_rectangle(0, 0, self.columns*self.square_size+1,
-                                     self.rows*self.square_size+1, width=0, fill="DARK GREY")
-        for r in list(range(self.rows)):
-            for c in list(range(self.columns)):
-                self.grid[r][c] = self.EMPTY
+        # One rectangle per cell; painting a cell only changes the fill of its rectangle.
+        # The rectangles are created again only when the dimensions of the grid change,
+        # otherwise repaint() recolors just the cells that differ from the old grid.
+        if len(self.cell_items) != self.rows or len(self.cell_items[0]) != self.columns:
+            self.canvas.delete("all")
+            self.canvas.create_rectangle(0, 0, self.columns*self.square_size+1,
+                                         self.rows*self.square_size+1, width=0, fill="DARK GREY")
+            s = self.square_size
+            self.cell_items = [[self.canvas.create_rectangle(1 + c * s, 1 + r * s, (c + 1) * s, (r + 1) * s,
+                                                             width=0, fill=self.cell_fills[self.EMPTY])
+                                for c in range(self.columns)] for r in range(self.rows)]
+            self.prev_grid = numpy.full((self.rows, self.columns), self.EMPTY, dtype=self.grid.dtype)
+        self.grid.fill(self.EMPTY)
         self.robotStart = self.Cell(self.rows-2, 1)
         self.targetPos = self.Cell(1, self.columns-2)
         self.fill_grid()
         if make_maze:
             maze = self.MyMaze(int(self.rows/2), int(self.columns/2))
-            for x in range(maze.gridDimensionX):
-                for y in range(maze.gridDimensionY):
-                    if maze.mazeGrid[x][y] == 'X':  # maze.wall_char:
-                        self.grid[x][y] = self.OBST
+            self.grid[:maze.gridDimensionX, :maze.gridDimensionY][maze.mazeGrid == 'X'] = self.OBST
         self.repaint()
 
     def fill_grid(self):
@@ -597,17 +683,14 @@ class Maze51:
         # with the same data.
         # With the second click removes any obstacles also.
         if self.searching or self.endOfSearch:
-            for r in list(range(self.rows)):
-                for c in list(range(self.columns)):
-                    if self.grid[r][c] in [self.FRONTIER, self.CLOSED, self.ROUTE]:
-                        self.grid[r][c] = self.EMPTY
-                    if self.grid[r][c] == self.ROBOT:
-                        self.robotStart = self.Cell(r, c)
+            searched = numpy.isin(self.grid, [self.FRONTIER, self.CLOSED, self.ROUTE])
+            self.grid[searched] = self.EMPTY
+            robot = numpy.argwhere(self.grid == self.ROBOT)
+            if robot.size:
+                self.robotStart = self.Cell(*robot[-1].tolist())
             self.searching = False
         else:
-            for r in list(range(self.rows)):
-                for c in list(range(self.columns)):
-                    self.grid[r][c] = self.EMPTY
+            self.grid.fill(self.EMPTY)
             self.robotStart = self.Cell(self.rows-2, 1)
             self.targetPos = self.Cell(1, self.columns-2)
         if self.selected_algo in ["A*", "Greedy"]:
@@ -621,37 +704,55 @@ class Maze51:
 
         self.openSet.clear()
         self.closedSet.clear()
-        self.openSet = [self.robotStart]
+        # BFS takes the states from the front of the OPEN SET, DFS from its end;
+        # the algorithm may still be changed after this, so both are served by a deque
+        self.openSet = collections.deque([self.robotStart])
         self.closedSet = []
-
-        self.grid[self.targetPos.row][self.targetPos.col] = self.TARGET
-        self.grid[self.robotStart.row][self.robotStart.col] = self.ROBOT
+        self.closedMap = {}
+        self.in_open_mask.fill(0)
+        self.closed_mask.fill(0)
+        self.in_open_mask[self.robotStart.row, self.robotStart.col] = 1
+        self.open_heap.clear()
+        heapq.heappush(self.open_heap, (self.robotStart.f, next(self.open_counter), self.robotStart))
+        self.openMap = {(self.robotStart.row, self.robotStart.col): self.robotStart}
+
+        self.grid[self.targetPos.row, self.targetPos.col] = self.TARGET
+        self.grid[self.robotStart.row, self.robotStart.col] = self.ROBOT
         self.message.configure(text=self.MSG_DRAW_AND_SELECT)
 
+        # the arrows of the previous search are not covered by the cells any more
+        self.canvas.delete("arrows")
+        self.dirty.clear()
         self.repaint()
 
     def repaint(self):
         """
-        Repaints the grid
-        """
-        color = ""
-        for r in list(range(self.rows)):
-            for c in list(range(self.columns)):
-                if self.grid[r][c] == self.EMPTY:
-                    color = "WHITE"
-                elif self.grid[r][c] == self.ROBOT:
-                    color = "RED"
-                elif self.grid[r][c] == self.TARGET:
-                    color = "GREEN"
-                elif self.grid[r][c] == self.OBST:
-                    color = "BLACK"
-                elif self.grid[r][c] == self.FRONTIER:
-                    color = "BLUE"
-                elif self.grid[r][c] == self.CLOSED:
-                    color = "CYAN"
-                elif self.grid[r][c] == self.ROUTE:
-                    color = "YELLOW"
-                self.paint_cell(r, c, color)
+        Repaints the cells whose value changed since they were last painted
+        """
+        changed = self.grid != self.prev_grid
+        rows, cols = numpy.nonzero(changed)
+        colors = self.cell_fills[self.grid[changed]]
+        itemconfig = self.canvas.itemconfig
+        cell_items = self.cell_items
+        for r, c, color in zip(rows.tolist(), cols.tolist(), colors.tolist()):
+            itemconfig(cell_items[r][c], fill=color)
+        self.prev_grid[changed] = self.grid[changed]
+
+    def flush_dirty(self):
+        """
+        Paints the cells changed by a search step, each one once with its final color
+        """
+        grid = self.grid
+        prev_grid = self.prev_grid
+        cell_fills = self.cell_fills
+        itemconfig = self.canvas.itemconfig
+        cell_items = self.cell_items
+        for r, c in self.dirty:
+            value = grid[r, c]
+            if value != prev_grid[r, c]:
+                itemconfig(cell_items[r][c], fill=cell_fills[value])
+                prev_grid[r, c] = value
+        self.dirty.clear()
 
     def paint_cell(self, row, col, color):
         """
@@ -661,16 +762,15 @@ class Maze51:
         :param col:   # the column of the cell
         :param color: # the color of the cell
         """
-        self.canvas.create_rectangle(1 + col * self.square_size, 1 + row * self.square_size,
-                                     1 + (col + 1) * self.square_size - 1, 1 + (row + 1) * self.square_size - 1,
-                                     width=0, fill=color)
+        self.canvas.itemconfig(self.cell_items[row][col], fill=self.rgb_colors[color])
+        self.prev_grid[row, col] = self.grid[row, col]
 
-    def reset_click(self):
+    def enable_controls(self):
         """
-        Action performed when user clicks "New grid" button
+        Enables all the buttons and the other controls, unless they are all enabled already
         """
-        self.animation = False
-        self.realTime = False
+        if self.controls_enabled:
+            return
         for but in self.buttons:
             but.configure(state="normal")
         self.buttons[3].configure(fg="BLACK")  # Real-Time button
@@ -679,6 +779,15 @@ class Maze51:
             but.configure(state="normal")
         self.diagonalBtn.configure(state="normal")
         self.drawArrowsBtn.configure(state="normal")
+        self.controls_enabled = True
+
+    def reset_click(self):
+        """
+        Action performed when user clicks "New grid" button
+        """
+        self.animation = False
+        self.realTime = False
+        self.enable_controls()
         self.initialize_grid(False)
 
     def maze_click(self):
@@ -687,14 +796,7 @@ class Maze51:
         """
         self.animation = False
         self.realTime = False
-        for but in self.buttons:
-            but.configure(state="normal")
-        self.buttons[3].configure(fg="BLACK")  # Real-Time button
-        self.slider.configure(state="normal")
-        for but in self.radio_buttons:
-            but.configure(state="normal")
-        self.diagonalBtn.configure(state="normal")
-        self.drawArrowsBtn.configure(state="normal")
+        self.enable_controls()
         self.initialize_grid(True)
 
     def clear_click(self):
@@ -703,14 +805,7 @@ class Maze51:
         """
         self.animation = False
         self.realTime = False
-        for but in self.buttons:
-            but.configure(state="normal")
-        self.buttons[3].configure(fg="BLACK")  # Real-Time button
-        self.slider.configure(state="normal")
-        for but in self.radio_buttons:
-            but.configure(state="normal")
-        self.diagonalBtn.configure(state="normal")
-        self.drawArrowsBtn.configure(state="normal")
+        self.enable_controls()
         self.fill_grid()
 
     def real_time_click(self):
@@ -721,11 +816,16 @@ class Maze51:
             return
         self.realTime = True
         self.searching = True
+        self.read_options()
         # The Dijkstra's initialization should be done just before the
         # start of search, because obstacles must be in place.
-        if self.selected_algo == "Dijkstra":
+        if self.selected_algo == "Dijkstra" and not self.compiled_search_available():
             self.initialize_dijkstra()
+        self.controls_enabled = False
         self.buttons[3].configure(fg="RED") # Real-Time button
+        # the search runs in batches between events, and only real_time_steps() may advance it
+        self.buttons[4].configure(state="disabled")  # Step-by-Step button
+        self.buttons[5].configure(state="disabled")  # Animation button
         self.slider.configure(state="disabled")
         for but in self.radio_buttons:
             but.configure(state="disabled")
@@ -733,12 +833,89 @@ class Maze51:
         self.drawArrowsBtn.configure(state="disabled")
         self.real_Time_action()
 
+    def read_options(self):
+        """
+        Reads the options of the search once, as their check buttons are disabled while it is in progress
+        """
+        self.diagonal_moves = bool(self.diagonal.get())
+        self.draw_arrows_on = bool(self.drawArrows.get())
+
     def real_Time_action(self):
         """
         Action performed during real-time search
         """
-        while not self.endOfSearch:
+        # a search started by a previous event has been cleared and is replaced by this one
+        if self.real_time_job is not None:
+            self.canvas.after_cancel(self.real_time_job)
+            self.real_time_job = None
+        if self.compiled_search_available():
+            self.compiled_search()
+        self.real_time_steps()
+
+    def real_time_steps(self):
+        """
+        Performs a batch of real-time search steps and schedules the next batch,
+        so that the canvas is redrawn and the mouse is handled while the search is in progress
+        """
+        self.real_time_job = None
+        for _ in range(self.REAL_TIME_BATCH):
+            if not self.realTime or self.endOfSearch:
+                return
             self.check_termination()
+        # after(1) rather than after(0), which would starve the redraws and the mouse events
+        self.real_time_job = self.canvas.after(1, self.real_time_steps)
+
+    def compiled_search_available(self):
+        """
+        Checks if the real-time search of the selected algorithm can be performed by the compiled kernels
+
+        :return: True, if numba is installed and DFS, BFS, A* or Dijkstra's algorithm is selected
+        """
+        return maze51_kernels.HAVE_NUMBA and self.selected_algo in ["DFS", "BFS", "A*", "Dijkstra"]
+
+    def compiled_search(self):
+        """
+        Performs the whole real-time search with the compiled kernels and leaves the grid,
+        the OPEN SET and the CLOSED SET as the step-by-step search would leave them.
+        """
+        if self.selected_algo == "DFS":
+            search = maze51_kernels.dfs_grid
+        elif self.selected_algo == "BFS":
+            search = maze51_kernels.bfs_grid
+        elif self.selected_algo == "A*":
+            search = maze51_kernels.astar_grid
+        else:
+            search = maze51_kernels.dijkstra_grid
+        parents, status, expanded, found = search(self.grid.view(), self.robotStart.row, self.robotStart.col,
+                                                  self.targetPos.row, self.targetPos.col,
+                                                  self.diagonal_moves)
+        # Each reached position becomes a Cell pointing to its predecessor
+        cells = {}
+        for idx in numpy.flatnonzero(status).tolist():
+            cells[idx] = self.Cell(*divmod(idx, self.columns))
+        for idx, cell in cells.items():
+            if parents[idx] >= 0:
+                cell.prev = cells[parents[idx]]
+        open_cells = [cell for idx, cell in cells.items() if status[idx] == maze51_kernels.OPEN]
+        self.closedSet = [cell for idx, cell in cells.items() if status[idx] == maze51_kernels.CLOSED]
+        self.closedMap = {(cell.row, cell.col): cell for cell in self.closedSet}
+        self.flat_grid[status == maze51_kernels.OPEN] = self.FRONTIER
+        self.flat_grid[status == maze51_kernels.CLOSED] = self.CLOSED
+        self.in_open_mask.reshape(-1)[:] = status == maze51_kernels.OPEN
+        self.closed_mask.reshape(-1)[:] = status == maze51_kernels.CLOSED
+        self.expanded = expanded
+        self.open_heap = []
+        if self.selected_algo == "Dijkstra":
+            self.prev[:] = parents
+        elif self.selected_algo == "A*":
+            self.openMap = {(cell.row, cell.col): cell for cell in open_cells}
+        else:
+            self.openSet = collections.deque(open_cells)
+        # If the target has not been found, the OPEN SET has been exhausted and
+        # check_termination() reports that there is no solution.
+        if found:
+            self.found = True
+            self.target_found()
 
     def step_by_step_click(self):
         """
@@ -746,11 +923,13 @@ class Maze51:
         """
         if self.found or self.endOfSearch:
             return
+        self.read_options()
         if not self.searching and self.selected_algo == "Dijkstra":
             self.initialize_dijkstra()
         self.animation = False
         self.searching = True
         self.message.configure(text=self.MSG_SELECT_STEP_BY_STEP_ETC)
+        self.controls_enabled = False
         self.buttons[3].configure(state="disabled") # Real-Time button
         for but in self.radio_buttons:
             but.configure(state="disabled")
@@ -763,27 +942,38 @@ class Maze51:
         Action performed when user clicks "Animation" button
         """
         self.animation = True
+        self.read_options()
         if not self.searching and self.selected_algo == "Dijkstra":
             self.initialize_dijkstra()
         self.searching = True
         self.message.configure(text=self.MSG_SELECT_STEP_BY_STEP_ETC)
+        self.controls_enabled = False
         self.buttons[3].configure(state="disabled") # Real-Time button
         for but in self.radio_buttons:
             but.configure(state="disabled")
         self.diagonalBtn.configure(state="disabled")
         self.drawArrowsBtn.configure(state="disabled")
         self.delay = self.slider.get()
+        self.next_step_time = time.monotonic()
         self.animation_action()
 
     def animation_action(self):
         """
         The action periodically performed during searching in animation mode
         """
+        if self.endOfSearch:
+            return
         if self.animation:
             self.check_termination()
+            # all the cells of this step have been recolored; redraw the canvas once for them
+            self.canvas.update_idletasks()
             if self.endOfSearch:
                 return
-            self.canvas.after(self.delay, self.animation_action)
+            # The steps are scheduled against a deadline, so that the time spent
+            # in a step is not added to the delay before the next one
+            now = time.monotonic()
+            self.next_step_time = max(self.next_step_time + self.delay / 1000, now)
+            self.canvas.after(int((self.next_step_time - now) * 1000), self.animation_action)
 
     def about_click(self):
         """
@@ -830,40 +1020,65 @@ class Maze51:
         # In the case of DFS, BFS, A* and Greedy algorithms
         # here we have the second step:
         # 2. If OPEN SET = [], then terminate. There is no solution.
-        if (self.selected_algo == "Dijkstra" and not self.graph) or\
-                self.selected_algo != "Dijkstra" and not self.openSet:
+        algo = self.algo_id
+        if (algo == self.ALGO_DIJKSTRA and not self.open_heap) or\
+                (algo in (self.ALGO_ASTAR, self.ALGO_GREEDY) and not self.openMap) or\
+                (algo <= self.ALGO_BFS and not self.openSet):
             self.endOfSearch = True
-            self.grid[self.robotStart.row][self.robotStart.col] = self.ROBOT
+            self.grid[self.robotStart.row, self.robotStart.col] = self.ROBOT
             self.message.configure(text=self.MSG_NO_SOLUTION)
+            self.controls_enabled = False
             self.buttons[4].configure(state="disabled")     # Step-by-Step button
             self.buttons[5].configure(state="disabled")     # Animation button
             self.slider.configure(state="disabled")
             self.repaint()
-            if self.drawArrows.get():
+            if self.draw_arrows_on:
                 self.draw_arrows()
         else:
             self.expand_node()
+            self.flush_dirty()
             if self.found:
-                self.endOfSearch = True
-                self.plot_route()
-                self.buttons[4].configure(state="disabled")  # Step-by-Step button
-                self.buttons[5].configure(state="disabled")  # Animation button
-                self.slider.configure(state="disabled")
+                self.target_found()
+
+    def target_found(self):
+        """
+        Terminates the search when the target has been found
+        """
+        self.endOfSearch = True
+        self.plot_route()
+        self.controls_enabled = False
+        self.buttons[4].configure(state="disabled")  # Step-by-Step button
+        self.buttons[5].configure(state="disabled")  # Animation button
+        self.slider.configure(state="disabled")
 
     def expand_node(self):
         """
         Expands a node and creates his successors
         """
+        algo = self.algo_id
+        diagonal = self.diagonal_moves
+        in_open_mask = self.in_open_mask
+        closed_mask = self.closed_mask
         # Dijkstra's algorithm to handle separately
-        if self.selected_algo == "Dijkstra":
+        if algo == self.ALGO_DIJKSTRA:
+            columns = self.columns
+            dist = self.dist
+            prev = self.prev
             # 11: while Q is not empty:
-            if not self.graph:
+            if not self.open_heap:
                 return
-            # 12:  u := vertex in Q (graph) with smallest distance in dist[] ;
-            # 13:  remove u from Q (graph);
-            u = self.graph.pop(0)
+            # 12:  u := vertex in Q (heap) with smallest distance in dist[] ;
+            # 13:  remove u from Q (heap);
+            u_id = heapq.heappop(self.open_heap)[2]
+            u = self.Cell(*divmod(u_id, columns))
+            u.dist = dist[u_id]
+            # (the predecessor of u has already been removed from Q)
+            if prev[u_id] >= 0:
+                u.prev = self.closedMap[divmod(int(prev[u_id]), columns)]
             # Add vertex u in closed set
             self.closedSet.append(u)
+            self.closedMap[(u.row, u.col)] = u
+            closed_mask[u.row, u.col] = 1
             # If target has been found ...
             if u == self.targetPos:
                 self.found = True
@@ -871,9 +1086,9 @@ class Maze51:
             # Counts nodes that have expanded.
             self.expanded += 1
             # Update the color of the cell
-            self.grid[u.row][u.col] = self.CLOSED
+            self.grid[u.row, u.col] = self.CLOSED
             # paint the cell
-            self.paint_cell(u.row, u.col, "CYAN")
+            self.dirty.append((u.row, u.col))
             # 14: if dist[u] = infinity:
             if u.dist == self.INFINITY:
                 # ... then there is no solution.
@@ -881,44 +1096,60 @@ class Maze51:
                 return
                 # 16: end if
             # Create the neighbors of u
-            neighbors = self.create_successors(u, False)
+            neighbors = self.create_successors(u)
             # 18: for each neighbor v of u:
             for v in neighbors:
+                v_id = v.row * columns + v.col
                 # 20: alt := dist[u] + dist_between(u, v) ;
                 alt = u.dist + self.dist_between(u, v)
                 # 21: if alt < dist[v]:
-                if alt < v.dist:
+                if alt < dist[v_id]:
                     # 22: dist[v] := alt ;
-                    v.dist = alt
+                    dist[v_id] = alt
                     # 23: previous[v] := u ;
-                    v.prev = u
+                    prev[v_id] = u_id
                     # Update the color of the cell
-                    self.grid[v.row][v.col] = self.FRONTIER
+                    self.grid[v.row, v.col] = self.FRONTIER
                     # paint the cell
-                    self.paint_cell(v.row, v.col, "BLUE")
+                    self.dirty.append((v.row, v.col))
                     # 24: decrease-key v in Q;
-                    # (sort list of nodes with respect to dist)
-                    self.graph.sort(key=attrgetter("dist"))
+                    # (push v again with its new distance; the old entry becomes stale)
+                    heapq.heappush(self.open_heap, (alt, next(self.open_counter), v_id))
+            # Drop the stale entries of vertices already removed from Q, so that an empty heap means that Q is empty
+            closed = closed_mask.reshape(-1)
+            while self.open_heap and closed[self.open_heap[0][2]]:
+                heapq.heappop(self.open_heap)
         # The handling of the other four algorithms
         else:
-            if self.selected_algo in ["DFS", "BFS"]:
+            if algo == self.ALGO_DFS:
                 # Here is the 3rd step of the algorithms DFS and BFS
                 # 3. Remove the first state, Si, from OPEN SET ...
-                current = self.openSet.pop(0)
+                # (the OPEN SET of DFS is a stack, whose first state is at the end of the deque)
+                current = self.openSet.pop()
+            elif algo == self.ALGO_BFS:
+                current = self.openSet.popleft()
             else:
                 # Here is the 3rd step of the algorithms A* and Greedy
                 # 3. Remove the first state, Si, from OPEN SET,
                 # for which f(Si) ≤ f(Sj) for all other
                 # open states Sj  ...
-                # (sort first OPEN SET list with respect to 'f')
-                self.openSet.sort(key=attrgetter("f"))
-                current = self.openSet.pop(0)
+                # (pop the heap, skipping the entries of cells that have been replaced;
+                # equal 'f' values are taken in the order the cells were added)
+                while True:
+                    current = heapq.heappop(self.open_heap)[2]
+                    if self.openMap.get((current.row, current.col)) is current:
+                        break
+                del self.openMap[(current.row, current.col)]
+            in_open_mask[current.row, current.col] = 0
             # ... and add it to CLOSED SET.
-            self.closedSet.insert(0, current)
+            # (the order of the CLOSED SET is of no importance, so append instead of shifting the whole list)
+            self.closedSet.append(current)
+            self.closedMap[(current.row, current.col)] = current
+            closed_mask[current.row, current.col] = 1
             # Update the color of the cell
-            self.grid[current.row][current.col] = self.CLOSED
+            self.grid[current.row, current.col] = self.CLOSED
             # paint the cell
-            self.paint_cell(current.row, current.col, "CYAN")
+            self.dirty.append((current.row, current.col))
             # If the selected node is the target ...
             if current == self.targetPos:
                 # ... then terminate etc
@@ -935,322 +1166,168 @@ class Maze51:
             #    Each successor has a pointer to the Si, as its predecessor.
             #    In the case of DFS and BFS algorithms, successors should not
             #    belong neither to the OPEN SET nor the CLOSED SET.
-            successors = self.create_successors(current, False)
+            successors = self.create_successors(current)
             # Here is the 5th step of the algorithms
             # 5. For each successor of Si, ...
             for cell in successors:
                 # ... if we are running DFS ...
-                if self.selected_algo == "DFS":
-                    # ... add the successor at the beginning of the list OPEN SET
-                    self.openSet.insert(0, cell)
+                if algo == self.ALGO_DFS:
+                    # ... add the successor at the beginning of the OPEN SET (the end of the deque)
+                    self.openSet.append(cell)
+                    in_open_mask[cell.row, cell.col] = 1
                     # Update the color of the cell
-                    self.grid[cell.row][cell.col] = self.FRONTIER
+                    self.grid[cell.row, cell.col] = self.FRONTIER
                     # paint the cell
-                    self.paint_cell(cell.row, cell.col, "BLUE")
+                    self.dirty.append((cell.row, cell.col))
                 # ... if we are runnig BFS ...
-                elif self.selected_algo == "BFS":
+                elif algo == self.ALGO_BFS:
                     # ... add the successor at the end of the list OPEN SET
                     self.openSet.append(cell)
+                    in_open_mask[cell.row, cell.col] = 1
                     # Update the color of the cell
-                    self.grid[cell.row][cell.col] = self.FRONTIER
+                    self.grid[cell.row, cell.col] = self.FRONTIER
                     # paint the cell
-                    self.paint_cell(cell.row, cell.col, "BLUE")
+                    self.dirty.append((cell.row, cell.col))
                 # ... if we are running A* or Greedy algorithms (step 5 of A* algorithm) ...
-                elif self.selected_algo in ["A*", "Greedy"]:
+                else:
                     # ... calculate the value f(Sj) ...
                     dxg = current.col - cell.col
                     dyg = current.row - cell.row
-                    dxh = self.targetPos.col - cell.col
-                    dyh = self.targetPos.row - cell.row
-                    if self.diagonal.get():
+                    if diagonal:
                         # with diagonal movements, calculate the Euclidean distance
-                        if self.selected_algo == "Greedy":
+                        if algo == self.ALGO_GREEDY:
                             # especially for the Greedy ...
                             cell.g = 0
                         else:
-                            cell.g = current.g + math.sqrt(dxg*dxg + dyg*dyg)
-                        cell.h = math.sqrt(dxh*dxh + dyh*dyh)
+                            cell.g = current.g + (_SQRT2 if dxg and dyg else 1.0)
                     else:
                         # without diagonal movements, calculate the Manhattan distance
-                        if self.selected_algo == "Greedy":
+                        if algo == self.ALGO_GREEDY:
                             # especially for the Greedy ...
                             cell.g = 0
                         else:
                             cell.g = current.g + abs(dxg) + abs(dyg)
-                        cell.h = abs(dxh) + abs(dyh)
+                    cell.h = self.heuristic(cell.row, cell.col)
                     cell.f = cell.g+cell.h
                     # ... If Sj is neither in the OPEN SET nor in the CLOSED SET states ...
-                    if cell not in self.openSet and cell not in self.closedSet:
+                    if not in_open_mask[cell.row, cell.col] and not closed_mask[cell.row, cell.col]:
                         # ... then add Sj in the OPEN SET ...
                         # ... evaluated as f(Sj)
-                        self.openSet.append(cell)
+                        heapq.heappush(self.open_heap, (cell.f, next(self.open_counter), cell))
+                        self.openMap[(cell.row, cell.col)] = cell
+                        in_open_mask[cell.row, cell.col] = 1
                         # Update the color of the cell
-                        self.grid[cell.row][cell.col] = self.FRONTIER
+                        self.grid[cell.row, cell.col] = self.FRONTIER
                         # paint the cell
-                        self.paint_cell(cell.row, cell.col, "BLUE")
+                        self.dirty.append((cell.row, cell.col))
                     # Else ...
                     else:
                         # ... if already belongs to the OPEN SET, then ...
-                        if cell in self.openSet:
-                            open_index = self.openSet.index(cell)
+                        if in_open_mask[cell.row, cell.col]:
                             # ... compare the new value assessment with the old one.
                             # If old <= new ...
-                            if self.openSet[open_index].f <= cell.f:
+                            if self.openMap[(cell.row, cell.col)].f <= cell.f:
                                 # ... then eject the new node with state Sj.
                                 # (ie do nothing for this node).
                                 pass
                             # Else, ...
                             else:
-                                # ... remove the element (Sj, old) from the list
-                                # to which it belongs ...
-                                self.openSet.pop(open_index)
-                                # ... and add the item (Sj, new) to the OPEN SET.
-                                self.openSet.append(cell)
+                                # ... replace the element (Sj, old) with the item (Sj, new)
+                                # in the OPEN SET; the old heap entry becomes stale.
+                                heapq.heappush(self.open_heap, (cell.f, next(self.open_counter), cell))
+                                self.openMap[(cell.row, cell.col)] = cell
                                 # Update the color of the cell
-                                self.grid[cell.row][cell.col] = self.FRONTIER
+                                self.grid[cell.row, cell.col] = self.FRONTIER
                                 # paint the cell
-                                self.paint_cell(cell.row, cell.col, "BLUE")
-                        # ... if already belongs to the CLOSED SET, then ...
-                        elif cell in self.closedSet:
-                            closed_index = self.closedSet.index(cell)
-                            # ... compare the new value assessment with the old one.
-                            # If old <= new ...
-                            if self.closedSet[closed_index].f <= cell.f:
-                                # ... then eject the new node with state Sj.
-                                # (ie do nothing for this node).
-                                pass
-                            # Else, ...
-                            else:
-                                # ... remove the element (Sj, old) from the list
-                                # to which it belongs ...
-                                self.closedSet.pop(closed_index)
-                                # ... and add the item (Sj, new) to the OPEN SET.
-                                self.openSet.append(cell)
-                                # Update the color of the cell
-                                self.grid[cell.row][cell.col] = self.FRONTIER
-                                # paint the cell
-                                self.paint_cell(cell.row, cell.col, "BLUE")
+                                self.dirty.append((cell.row, cell.col))
+                        # ... a cell of the CLOSED SET is never reopened: both heuristics are consistent, so a
+                        # smaller 'f' only comes from rounding of summed diagonal costs (not a shorter path).
 
-    def create_successors(self, current, make_connected):
+    def create_successors(self, current):
         """
         Creates the successors of a state/cell
 
-        :param current:        the cell for which we ask successors
-        :param make_connected: flag that indicates that we are interested only on the coordinates
-                               of cells and not on the label 'dist' (concerns only Dijkstra's)
-        :return:               the successors of the cell as a list
+        :param current: the cell for which we ask successors
+        :return:        the successors of the cell as a list
         """
         r = current.row
         c = current.col
+        algo = self.algo_id
+        grid = self.grid
+        obst = self.OBST
+        rows = self.rows
+        columns = self.columns
+        in_open_mask = self.in_open_mask
+        closed_mask = self.closed_mask
+        cell_class = self.Cell
+        dijkstra = algo == self.ALGO_DIJKSTRA
+        # Only DFS and BFS skip the successors that already belong to the OPEN SET or to the CLOSED SET
+        check_sets = algo <= self.ALGO_BFS
         # We create an empty list for the successors of the current cell.
         temp = []
+        append = temp.append
         # With diagonal movements priority is:
         # 1: Up 2: Up-right 3: Right 4: Down-right
         # 5: Down 6: Down-left 7: Left 8: Up-left
 
         # Without diagonal movements the priority is:
         # 1: Up 2: Right 3: Down 4: Left
-
-        # If not at the topmost limit of the grid
-        # and the up-side cell is not an obstacle
-        # and (only in the case are not running the A* or Greedy)
-        # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-        if r > 0 and self.grid[r-1][c] != self.OBST and\
-                (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                 (self.selected_algo in ["DFS", "BFS"]
-                 and not self.Cell(r-1, c) in self.openSet and not self.Cell(r-1, c) in self.closedSet)):
-            cell = self.Cell(r-1, c)
-            # In the case of Dijkstra's algorithm we can not append to
-            # the list of successors the "naked" cell we have just created.
-            # The cell must be accompanied by the label 'dist',
-            # so we need to track it down through the list 'graph'
-            # and then copy it back to the list of successors.
-            # The flag makeConnected is necessary to be able
-            # the present method create_succesors() to collaborate
-            # with the method find_connected_component(), which creates
-            # the connected component when Dijkstra's initializes.
-            if self.selected_algo == "Dijkstra":
-                if make_connected:
-                    temp.append(cell)
-                elif cell in self.graph:
-                    graph_index = self.graph.index(cell)
-                    temp.append(self.graph[graph_index])
-            else:
-                # ... update the pointer of the up-side cell so it points the current one ...
-                cell.prev = current
-                # ... and add the up-side cell to the successors of the current one.
-                temp.append(cell)
-
-        if self.diagonal.get():
-            # If we are not even at the topmost nor at the rightmost border of the grid
-            # and the up-right-side cell is not an obstacle
-            # and one of the upper side or right side cells are not obstacles
-            # (because it is not reasonable to allow the robot to pass through a "slot")
-            # and (only in the case are not running the A* or Greedy)
-            # not already belongs neither to the OPEN SET nor CLOSED SET ...
-            if r > 0 and c < self.columns-1 and self.grid[r-1][c+1] != self.OBST and \
-                    (self.grid[r-1][c] != self.OBST or self.grid[r][c+1] != self.OBST) and \
-                    (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                     (self.selected_algo in ["DFS", "BFS"]
-                     and not self.Cell(r-1, c+1) in self.openSet and not self.Cell(r-1, c+1) in self.closedSet)):
-                cell = self.Cell(r-1, c+1)
-                if self.selected_algo == "Dijkstra":
-                    if make_connected:
-                        temp.append(cell)
-                    elif cell in self.graph:
-                        graph_index = self.graph.index(cell)
-                        temp.append(self.graph[graph_index])
-                else:
-                    # ... update the pointer of the up-right-side cell so it points the current one ...
-                    cell.prev = current
-                    # ... and add the up-right-side cell to the successors of the current one.
-                    temp.append(cell)
-
-        # If not at the rightmost limit of the grid
-        # and the right-side cell is not an obstacle ...
-        # and (only in the case are not running the A* or Greedy)
-        # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-        if c < self.columns-1 and self.grid[r][c+1] != self.OBST and\
-                (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                 (self.selected_algo in ["DFS", "BFS"]
-                 and not self.Cell(r, c+1) in self.openSet and not self.Cell(r, c+1) in self.closedSet)):
-            cell = self.Cell(r, c+1)
-            if self.selected_algo == "Dijkstra":
-                if make_connected:
-                    temp.append(cell)
-                elif cell in self.graph:
-                    graph_index = self.graph.index(cell)
-                    temp.append(self.graph[graph_index])
-            else:
-                # ... update the pointer of the right-side cell so it points the current one ...
-                cell.prev = current
-                # ... and add the right-side cell to the successors of the current one.
-                temp.append(cell)
-
-        if self.diagonal.get():
-            # If we are not even at the lowermost nor at the rightmost border of the grid
-            # and the down-right-side cell is not an obstacle
-            # and one of the down-side or right-side cells are not obstacles
-            # and (only in the case are not running the A* or Greedy)
+        for dr, dc in _OFFSETS8 if self.diagonal_moves else _OFFSETS4:
+            nr = r + dr
+            nc = c + dc
+            # If not beyond the limits of the grid
+            # and the neighbor cell is not an obstacle ...
+            if not (0 <= nr < rows and 0 <= nc < columns) or grid[nr, nc] == obst:
+                continue
+            # ... and, for a diagonal neighbor, one of the two cells beside both of them is not an obstacle
+            # (because it is not reasonable to allow the robot to pass through a "slot") ...
+            if dr and dc and grid[nr, c] == obst and grid[r, nc] == obst:
+                continue
+            # ... and (only in the case are not running the A*, Greedy or Dijkstra)
             # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-            if r < self.rows-1 and c < self.columns-1 and self.grid[r+1][c+1] != self.OBST and \
-                    (self.grid[r+1][c] != self.OBST or self.grid[r][c+1] != self.OBST) and \
-                    (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                     (self.selected_algo in ["DFS", "BFS"]
-                     and not self.Cell(r+1, c+1) in self.openSet and not self.Cell(r+1, c+1) in self.closedSet)):
-                cell = self.Cell(r+1, c+1)
-                if self.selected_algo == "Dijkstra":
-                    if make_connected:
-                        temp.append(cell)
-                    elif cell in self.graph:
-                        graph_index = self.graph.index(cell)
-                        temp.append(self.graph[graph_index])
-                else:
-                    # ... update the pointer of the downr-right-side cell so it points the current one ...
-                    cell.prev = current
-                    # ... and add the down-right-side cell to the successors of the current one.
-                    temp.append(cell)
-
-        # If not at the lowermost limit of the grid
-        # and the down-side cell is not an obstacle
-        # and (only in the case are not running the A* or Greedy)
-        # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-        if r < self.rows-1 and self.grid[r+1][c] != self.OBST and \
-                (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                 (self.selected_algo in ["DFS", "BFS"]
-                 and not self.Cell(r+1, c) in self.openSet and not self.Cell(r+1, c) in self.closedSet)):
-            cell = self.Cell(r+1, c)
-            if self.selected_algo == "Dijkstra":
-                if make_connected:
-                    temp.append(cell)
-                elif cell in self.graph:
-                    graph_index = self.graph.index(cell)
-                    temp.append(self.graph[graph_index])
-            else:
-                # ... update the pointer of the down-side cell so it points the current one ...
-                cell.prev = current
-                # ... and add the down-side cell to the successors of the current one.
-                temp.append(cell)
-
-        if self.diagonal.get():
-            # If we are not even at the lowermost nor at the leftmost border of the grid
-            # and the down-left-side cell is not an obstacle
-            # and one of the down-side or left-side cells are not obstacles
-            # and (only in the case are not running the A* or Greedy)
-            # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-            if r < self.rows-1 and c > 0 and self.grid[r+1][c-1] != self.OBST and \
-                    (self.grid[r+1][c] != self.OBST or self.grid[r][c-1] != self.OBST) and \
-                    (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                     (self.selected_algo in ["DFS", "BFS"]
-                     and not self.Cell(r+1, c-1) in self.openSet and not self.Cell(r+1, c-1) in self.closedSet)):
-                cell = self.Cell(r+1, c-1)
-                if self.selected_algo == "Dijkstra":
-                    if make_connected:
-                        temp.append(cell)
-                    elif cell in self.graph:
-                        graph_index = self.graph.index(cell)
-                        temp.append(self.graph[graph_index])
-                else:
-                    # ... update the pointer of the down-left-side cell so it points the current one ...
-                    cell.prev = current
-                    # ... and add the down-left-side cell to the successors of the current one.
-                    temp.append(cell)
-
-        # If not at the leftmost limit of the grid
-        # and the left-side cell is not an obstacle
-        # and (only in the case are not running the A* or Greedy)
-        # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-        if c > 0 and self.grid[r][c-1] != self.OBST and \
-                (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                 (self.selected_algo in ["DFS", "BFS"]
-                 and not self.Cell(r, c-1) in self.openSet and not self.Cell(r, c-1) in self.closedSet)):
-            cell = self.Cell(r, c-1)
-            if self.selected_algo == "Dijkstra":
-                if make_connected:
-                    temp.append(cell)
-                elif cell in self.graph:
-                    graph_index = self.graph.index(cell)
-                    temp.append(self.graph[graph_index])
+            if check_sets and (in_open_mask[nr, nc] or closed_mask[nr, nc]):
+                continue
+            # In the case of Dijkstra's algorithm the successors are "naked" cells,
+            # because their labels 'dist' and 'previous' are kept in the arrays dist and prev,
+            # and the vertices already removed from Q are not successors.
+            if dijkstra:
+                if not closed_mask[nr, nc]:
+                    append(cell_class(nr, nc))
             else:
-                # ... update the pointer of the left-side cell so it points the current one ...
+                cell = cell_class(nr, nc)
+                # ... update the pointer of the neighbor cell so it points the current one ...
                 cell.prev = current
-                # ... and add the left-side cell to the successors of the current one.
-                temp.append(cell)
-
-        if self.diagonal.get():
-            # If we are not even at the topmost nor at the leftmost border of the grid
-            # and the up-left-side cell is not an obstacle
-            # and one of the up-side or left-side cells are not obstacles
-            # and (only in the case are not running the A* or Greedy)
-            # not already belongs neither to the OPEN SET nor to the CLOSED SET ...
-            if r > 0 and c > 0 and self.grid[r-1][c-1] != self.OBST and \
-                    (self.grid[r-1][c] != self.OBST or self.grid[r][c-1] != self.OBST) and \
-                    (self.selected_algo in ["A*", "Greedy", "Dijkstra"] or
-                     (self.selected_algo in ["DFS", "BFS"]
-                     and not self.Cell(r-1, c-1) in self.openSet and not self.Cell(r-1, c-1) in self.closedSet)):
-                cell = self.Cell(r-1, c-1)
-                if self.selected_algo == "Dijkstra":
-                    if make_connected:
-                        temp.append(cell)
-                    elif cell in self.graph:
-                        graph_index = self.graph.index(cell)
-                        temp.append(self.graph[graph_index])
-                else:
-                    # ... update the pointer of the up-left-side cell so it points the current one ...
-                    cell.prev = current
-                    # ... and add the up-left-side cell to the successors of the current one.
-                    temp.append(cell)
+                # ... and add the neighbor cell to the successors of the current one.
+                append(cell)
 
         # When DFS algorithm is in use, cells are added one by one at the beginning of the
         # OPEN SET list. Because of this, we must reverse the order of successors formed,
         # so the successor corresponding to the highest priority, to be placed the first in the list.
         # For the Greedy, A* and Dijkstra's no issue, because the list is sorted
         # according to 'f' or 'dist' before extracting the first element of.
-        if self.selected_algo == "DFS":
+        if algo == self.ALGO_DFS:
             return reversed(temp)
         else:
             return temp
 
+    def heuristic(self, row, col):
+        """
+        Returns the value of the heuristic function h of A* and Greedy algorithms for a cell
+
+        :param row: the row of the cell
+        :param col: the column of the cell
+        :return:    the distance of the cell from the target
+        """
+        dxh = self.targetPos.col - col
+        dyh = self.targetPos.row - row
+        if self.diagonal_moves:
+            # with diagonal movements calculate the Euclidean distance
+            h = self.hyp[abs(dyh), abs(dxh)]
+        else:
+            # without diagonal movements calculate the Manhattan distance
+            h = abs(dxh) + abs(dyh)
+        return h
+
     def dist_between(self, u, v):
         """
         Returns the distance between two cells
@@ -1261,9 +1338,9 @@ class Maze51:
         """
         dx = u.col - v.col
         dy = u.row - v.row
-        if self.diagonal.get():
+        if self.diagonal_moves:
             # with diagonal movements calculate the Euclidean distance
-            return math.sqrt(dx*dx + dy*dy)
+            return _SQRT2 if dx and dy else 1.0
         else:
             # without diagonal movements calculate the Manhattan distance
             return abs(dx) + abs(dy)
@@ -1273,53 +1350,43 @@ class Maze51:
         Calculates the path from the target to the initial position of the robot,
         counts the corresponding steps and measures the distance traveled.
         """
-        self.repaint()
         self.searching = False
-        steps = 0
-        distance = 0.0
-        index = self.closedSet.index(self.targetPos)
-        cur = self.closedSet[index]
-        self.grid[cur.row][cur.col] = self.TARGET
-        self.paint_cell(cur.row, cur.col, "GREEN")
-        while cur != self.robotStart:
-            steps += 1
-            if self.diagonal.get():
-                dx = cur.col - cur.prev.col
-                dy = cur.row - cur.prev.row
-                distance += math.sqrt(dx*dx + dy*dy)
-            else:
-                distance += 1
+        grid = self.grid
+        robot_row = self.robotStart.row
+        robot_col = self.robotStart.col
+        cur = self.closedMap[(self.targetPos.row, self.targetPos.col)]
+        grid[cur.row, cur.col] = self.TARGET
+        # Walk the whole route first; its cells are painted afterwards in one pass
+        route = [(cur.row, cur.col)]
+        append = route.append
+        # a route visits every cell at most once, so a longer walk means that the predecessors form a cycle
+        max_cells = self.rows * self.columns
+        while cur.row != robot_row or cur.col != robot_col:
+            if len(route) >= max_cells:
+                raise RuntimeError("predecessor cycle")
             cur = cur.prev
-            self.grid[cur.row][cur.col] = self.ROUTE
-            self.paint_cell(cur.row, cur.col, "YELLOW")
+            append((cur.row, cur.col))
+        route = numpy.array(route)
+        steps = len(route) - 1
+        # The moves (dy, dx) of the robot along the route
+        moves = numpy.diff(route, axis=0)
+        if self.diagonal_moves:
+            # with diagonal movements a move is 1 or, if diagonal, sqrt(2) long
+            distance = float(numpy.where(moves.all(axis=1), _SQRT2, 1.0).sum())
+        else:
+            # without diagonal movements every move is 1 long
+            distance = float(numpy.abs(moves).sum())
+        grid[route[1:, 0], route[1:, 1]] = self.ROUTE
 
-        self.grid[self.robotStart.row][self.robotStart.col] = self.ROBOT
-        self.paint_cell(self.robotStart.row, self.robotStart.col, "RED")
+        grid[robot_row, robot_col] = self.ROBOT
+        self.repaint()
 
-        if self.drawArrows.get():
+        if self.draw_arrows_on:
             self.draw_arrows()
 
         msg = "Nodes expanded: {0}, Steps: {1}, Distance: {2:.3f}".format(self.expanded, steps, distance)
         self.message.configure(text=msg)
 
-    def find_connected_component(self, v):
-        """
-        Appends to the list containing the nodes of the graph only
-        the cells belonging to the same connected component with node v.
-
-        :param v: the starting node
-        """
-        # This is a Breadth First Search of the graph starting from node v.
-        stack = [v]
-        self.graph.append(v)
-        while stack:
-            v = stack.pop()
-            successors = self.create_successors(v, True)
-            for c in successors:
-                if c not in self.graph:
-                    stack.append(c)
-                    self.graph.append(c)
-
     def initialize_dijkstra(self):
         """
         Initialization of Dijkstra's algorithm
@@ -1329,139 +1396,118 @@ class Maze51:
         # nodes in the queue Q.
         # Only when we run out of queue and the target has not been found,
         # can answer that there is no solution.
-        # As is known, the algorithm models the problem as a connected graph
-        # It is obvious that no solution exists only when the graph is not
-        # connected and the target is in a different connected component
-        # of this initial position of the robot
-        # To be thus possible negative response from the algorithm,
-        # should search be made ONLY in the coherent component to which the
-        # initial position of the robot belongs.
-
-        # First create the connected component
-        # to which the initial position of the robot belongs.
-        self.graph.clear()
-        self.find_connected_component(self.robotStart)
+        # Q only ever holds vertices reached from the initial position of the robot,
+        # so the search stays in the connected component to which that position belongs,
+        # and Q runs out when the target is in a different component.
+
         # Here is the initialization of Dijkstra's algorithm
         # 2: for each vertex v in Graph;
-        for v in self.graph:
-            # 3: dist[v] := infinity ;
-            v.dist = self.INFINITY
-            # 5: previous[v] := undefined ;
-            v.prev = None
+        # 3: dist[v] := infinity ;
+        self.dist.fill(self.INFINITY)
+        # 5: previous[v] := undefined ;
+        self.prev.fill(-1)
         # 8: dist[source] := 0;
-        self.graph[self.graph.index(self.robotStart)].dist = 0
+        source = self.robotStart.row * self.columns + self.robotStart.col
+        self.dist[source] = 0
         # 9: Q := the set of all nodes in Graph;
-        # Instead of the variable Q we will use the list
-        # 'graph' itself, which has already been initialised.
-
-        # Sorts the list of nodes with respect to 'dist'.
-        self.graph.sort(key=attrgetter("dist"))
+        # Q is a heap ordered by 'dist'. The vertices with infinite distance
+        # are pushed when they are first reached.
+        self.open_heap = [(0, next(self.open_counter), source)]
         # Initializes the list of closed nodes
         self.closedSet.clear()
+        self.closedMap.clear()
+        self.closed_mask.fill(0)
 
     def draw_arrows(self):
         """
         Draws the arrows to predecessors
         """
+        grid = self.grid
+        frontier = self.FRONTIER
+        closed = self.CLOSED
+        # The size and the thickness of the arrows are the same for all of them
+        a = self.arrow_size
+        width = 2 if self.square_size >= 25 else 1
         # We draw black arrows from each open or closed state to its predecessor.
-        for r in range(self.rows):
-            for c in range(self.columns):
-                tail = head = cell = self.Cell(r, c)
-                # If the current cell is an open state, or is a closed state
-                # but not the initial position of the robot
-                if self.grid[r][c] in [self.FRONTIER, self.CLOSED] and not cell == self.robotStart:
-                    # The tail of the arrow is the current cell, while
-                    # the arrowhead is the predecessor cell.
-                    if self.grid[r][c] == self.FRONTIER:
-                        if self.selected_algo == "Dijkstra":
-                            tail = self.graph[self.graph.index(cell)]
-                            head = tail.prev
-                        else:
-                            tail = self.openSet[self.openSet.index(cell)]
-                            head = tail.prev
-                    elif self.grid[r][c] == self.CLOSED:
-                        tail = self.closedSet[self.closedSet.index(cell)]
-                        head = tail.prev
-
-                    self.draw_arrow(tail, head, self.arrow_size, "BLACK", 2 if self.square_size >= 25 else 1)
+        # The tail of the arrow is the state, while the arrowhead is the predecessor.
+        # The arrows are collected as (tail row, tail column, head row, head column)
+        # and their points are calculated all together.
+        # Only the states still painted as open or closed get an arrow: the route has
+        # its own red arrows, and the initial position of the robot has no predecessor.
+        arrows = []
+        if self.algo_id == self.ALGO_DIJKSTRA:
+            # The open vertices are the cells of Q; their predecessors are kept in the array prev
+            columns = self.columns
+            for idx in numpy.flatnonzero(self.flat_grid == frontier).tolist():
+                r, c = divmod(idx, columns)
+                pr, pc = divmod(int(self.prev[idx]), columns)
+                arrows.append((r, c, pr, pc))
+        else:
+            open_set = self.openMap.values() if self.algo_id in (self.ALGO_ASTAR, self.ALGO_GREEDY) else self.openSet
+            for tail in open_set:
+                if grid[tail.row, tail.col] == frontier:
+                    head = tail.prev
+                    arrows.append((tail.row, tail.col, head.row, head.col))
+        for tail in self.closedSet:
+            if grid[tail.row, tail.col] == closed:
+                head = tail.prev
+                arrows.append((tail.row, tail.col, head.row, head.col))
+        self.draw_arrow_lines(arrows, a, "BLACK", width)
 
         if self.found:
             # We draw red arrows along the path from robotStart to targetPos.
-            # index = self.closedSet.index(self.targetPos)
-            cur = self.closedSet[self.closedSet.index(self.targetPos)]
-            while cur != self.robotStart:
+            arrows = []
+            robot_row = self.robotStart.row
+            robot_col = self.robotStart.col
+            cur = self.closedMap[(self.targetPos.row, self.targetPos.col)]
+            while cur.row != robot_row or cur.col != robot_col:
                 head = cur
                 cur = cur.prev
                 tail = cur
-                self.draw_arrow(tail, head, self.arrow_size, "RED", 2 if self.square_size >= 25 else 1)
+                arrows.append((tail.row, tail.col, head.row, head.col))
+            self.draw_arrow_lines(arrows, a, "RED", width)
 
-    def draw_arrow(self, tail, head, a, color, width):
+    def draw_arrow_lines(self, arrows, a, color, width):
         """
-        Draws an arrow from center of tail cell to center of head cell
+        Draws arrows from center of tail cells to center of head cells
 
-        :param tail:   the tail of the arrow
-        :param head:   the head of the arrow
+        :param arrows: the arrows, as (tail row, tail column, head row, head column)
         :param a:      size of arrow tips
-        :param color:  color of the arrow
+        :param color:  color of the arrows
         :param width:  thickness of the lines
         """
-        # The coordinates of the center of the tail cell
-        x1 = 1 + tail.col * self.square_size + self.square_size / 2
-        y1 = 1 + tail.row * self.square_size + self.square_size / 2
-        # The coordinates of the center of the head cell
-        x2 = 1 + head.col * self.square_size + self.square_size / 2
-        y2 = 1 + head.row * self.square_size + self.square_size / 2
-
-        sin20 = math.sin(20*math.pi/180)
-        cos20 = math.cos(20*math.pi/180)
-        sin25 = math.sin(25*math.pi/180)
-        cos25 = math.cos(25*math.pi/180)
-        u3 = v3 = u4 = v4 = 0
-
-        if x1 == x2 and y1 > y2:  # up
-            u3 = x2 - a*sin20
-            v3 = y2 + a*cos20
-            u4 = x2 + a*sin20
-            v4 = v3
-        elif x1 < x2 and y1 > y2:  # up-right
-            u3 = x2 - a*cos25
-            v3 = y2 + a*sin25
-            u4 = x2 - a*sin25
-            v4 = y2 + a*cos25
-        elif x1 < x2 and y1 == y2:  # right
-            u3 = x2 - a*cos20
-            v3 = y2 - a*sin20
-            u4 = u3
-            v4 = y2 + a*sin20
-        elif x1 < x2 and y1 < y2:  # righr-down
-            u3 = x2 - a*cos25
-            v3 = y2 - a*sin25
-            u4 = x2 - a*sin25
-            v4 = y2 - a*cos25
-        elif x1 == x2 and y1 < y2:  # down
-            u3 = x2 - a*sin20
-            v3 = y2 - a*cos20
-            u4 = x2 + a*sin20
-            v4 = v3
-        elif x1 > x2 and y1 < y2:  # left-down
-            u3 = x2 + a*sin25
-            v3 = y2 - a*cos25
-            u4 = x2 + a*cos25
-            v4 = y2 - a*sin25
-        elif x1 > x2 and y1 == y2:  # left
-            u3 = x2 + a*cos20
-            v3 = y2 - a*sin20
-            u4 = u3
-            v4 = y2 + a*sin20
-        elif x1 > x2 and y1 > y2:  # left-up
-            u3 = x2 + a*sin25
-            v3 = y2 + a*cos25
-            u4 = x2 + a*cos25
-            v4 = y2 + a*sin25
-
-        self.canvas.create_line(x1, y1, x2, y2, fill=color, width=width)
-        self.canvas.create_line(x2, y2, u3, v3, fill=color, width=width)
-        self.canvas.create_line(x2, y2, u4, v4, fill=color, width=width)
+        if not arrows:
+            return
+        # The shaft and the two tips are drawn as a single polyline, so each arrow is one canvas item.
+        create_line = self.canvas.create_line
+        for points in self.arrow_points(numpy.array(arrows), a).tolist():
+            create_line(points, fill=color, width=width, tags="arrows")
+
+    def arrow_points(self, arrows, a):
+        """
+        Returns the points of the polylines of arrows from center of tail cells to center of head cells:
+        the tail, the head, the end of the one tip, the head again and the end of the other tip
+
+        :param arrows: the arrows, as an array of rows (tail row, tail column, head row, head column)
+        :param a:      size of arrow tips
+        :return:       the coordinates x, y of the points of each arrow, as the rows of an array
+        """
+        s = self.square_size
+        half = 1 + s / 2
+        # The coordinates of the centers of the tail cells
+        x1 = arrows[:, 1] * s + half
+        y1 = arrows[:, 0] * s + half
+        # The coordinates of the centers of the head cells
+        x2 = arrows[:, 3] * s + half
+        y2 = arrows[:, 2] * s + half
+
+        tips = _ARROW_TIP_TABLE[numpy.sign(x2 - x1).astype(int) + 1, numpy.sign(y2 - y1).astype(int) + 1]
+        u3 = x2 + a*tips[:, 0]
+        v3 = y2 + a*tips[:, 1]
+        u4 = x2 + a*tips[:, 2]
+        v4 = y2 + a*tips[:, 3]
+
+        return numpy.column_stack((x1, y1, x2, y2, u3, v3, x2, y2, u4, v4))
 
     @staticmethod
     def center(window):
@@ -1477,11 +1523,11 @@ class Maze51:
         window.geometry("%dx%d+%d+%d" % (size + (x, y)))
 
     @staticmethod
-    def source_code_callback(self):
+    def source_code_callback(event=None):
         webbrowser.open_new(r"https://goo.gl/tRaLfe")
 
     @staticmethod
-    def video_callback(self):
+    def video_callback(event=None):
         webbrowser.open_new(r"https://youtu.be/7GLqy61X2oU")
 
 
@@ -0,0 +1,354 @@
+"""
+Compiled kernels of Maze 5.1
+
+The functions of this module perform a whole DFS, BFS, A* or Dijkstra's search
+directly on the numpy array of the grid, or generate a whole random maze
+on the arrays of MyMaze, so that the interpreter is not involved in every
+single cell visit.
+They are compiled with numba when it is available. If numba cannot be
+imported, HAVE_NUMBA is False and Maze51 keeps using its own Python code.
+"""
+import math
+import numpy
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in of numba.njit, that leaves the function as it is
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+OBST = 1          # cell with obstacle (the same value as Maze51.OBST)
+
+UNSEEN = 0        # cell not reached yet
+OPEN = 1          # cell that belongs to the OPEN SET
+CLOSED = 2        # cell that belongs to the CLOSED SET
+
+# The row and column offsets of the neighbors, in the priority order of Maze51.create_successors()
+# 1: Up 2: Up-right 3: Right 4: Down-right 5: Down 6: Down-left 7: Left 8: Up-left
+NEIGHBOR_ROWS = numpy.array([-1, -1, 0, 1, 1, 1, 0, -1])
+NEIGHBOR_COLS = numpy.array([0, 1, 1, 1, 0, -1, -1, -1])
+
+# The offsets of the cells that could potentially be neighbors of a cell of MyMaze
+MAZE_DX = numpy.array([1, 0, -1, 0])
+MAZE_DY = numpy.array([0, 1, 0, -1])
+
+
+@njit(cache=True)
+def _heap_push(heap_f, heap_seq, heap_idx, size, f, seq, idx):
+    """
+    Inserts a cell in the binary heap of the OPEN SET
+
+    :param heap_f:   the keys ('f' or 'dist') of the heap entries
+    :param heap_seq: the insertion order of the entries, that breaks the ties of the keys
+    :param heap_idx: the (flat) index of the cell of each entry
+    :param size:     the number of the entries in the heap
+    :param f:        the key of the new entry
+    :param seq:      the insertion order of the new entry
+    :param idx:      the (flat) index of the cell of the new entry
+    :return:         the new number of entries
+    """
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap_f[parent] < f or (heap_f[parent] == f and heap_seq[parent] < seq):
+            break
+        heap_f[i] = heap_f[parent]
+        heap_seq[i] = heap_seq[parent]
+        heap_idx[i] = heap_idx[parent]
+        i = parent
+    heap_f[i] = f
+    heap_seq[i] = seq
+    heap_idx[i] = idx
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap_f, heap_seq, heap_idx, size):
+    """
+    Removes the entry with the smallest key from the binary heap of the OPEN SET
+
+    :return: the (flat) index of the cell of the removed entry and the new number of entries
+    """
+    top = heap_idx[0]
+    size -= 1
+    f = heap_f[size]
+    seq = heap_seq[size]
+    idx = heap_idx[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and (heap_f[child + 1] < heap_f[child] or
+                                 (heap_f[child + 1] == heap_f[child] and heap_seq[child + 1] < heap_seq[child])):
+            child += 1
+        if f < heap_f[child] or (f == heap_f[child] and seq < heap_seq[child]):
+            break
+        heap_f[i] = heap_f[child]
+        heap_seq[i] = heap_seq[child]
+        heap_idx[i] = heap_idx[child]
+        i = child
+    if size > 0:
+        heap_f[i] = f
+        heap_seq[i] = seq
+        heap_idx[i] = idx
+    return top, size
+
+
+@njit(cache=True)
+def _search(grid, sr, sc, tr, tc, diagonal, heuristic):
+    """
+    Best-first search of the grid from (sr, sc) to (tr, tc)
+
+    :param grid:      the grid, as a 2-D numpy array
+    :param sr:        the row of the initial position of the robot
+    :param sc:        the column of the initial position of the robot
+    :param tr:        the row of the target
+    :param tc:        the column of the target
+    :param diagonal:  flag that indicates that diagonal movements are allowed
+    :param heuristic: True for A*, False for Dijkstra's algorithm
+    :return:          the predecessors and the state (UNSEEN, OPEN, CLOSED) of the cells,
+                      as flat arrays, the number of nodes expanded and the flag that the goal was found
+    """
+    rows, cols = grid.shape
+    n = rows * cols
+    parents = numpy.full(n, -1, numpy.int32)
+    status = numpy.zeros(n, numpy.uint8)
+    g = numpy.full(n, numpy.inf)
+    f_score = numpy.full(n, numpy.inf)
+    # Every relaxation pushes a new entry; the stale ones are skipped when popped.
+    capacity = 8 * n + 1
+    heap_f = numpy.empty(capacity)
+    heap_seq = numpy.empty(capacity, numpy.int32)
+    heap_idx = numpy.empty(capacity, numpy.int32)
+
+    start = sr * cols + sc
+    target = tr * cols + tc
+    g[start] = 0.0
+    f_score[start] = 0.0
+    status[start] = OPEN
+    size = _heap_push(heap_f, heap_seq, heap_idx, 0, 0.0, 0, start)
+    seq = 1
+    expanded = 0
+    found = False
+    step = 1 if diagonal else 2
+    while size > 0:
+        u, size = _heap_pop(heap_f, heap_seq, heap_idx, size)
+        if status[u] == CLOSED:
+            continue
+        status[u] = CLOSED
+        if u == target:
+            found = True
+            break
+        expanded += 1
+        r = u // cols
+        c = u - r * cols
+        for k in range(0, 8, step):
+            dr = NEIGHBOR_ROWS[k]
+            dc = NEIGHBOR_COLS[k]
+            nr = r + dr
+            nc = c + dc
+            if nr < 0 or nr >= rows or nc < 0 or nc >= cols or grid[nr, nc] == OBST:
+                continue
+            if dr != 0 and dc != 0:
+                # it is not reasonable to allow the robot to pass through a "slot"
+                if grid[nr, c] == OBST and grid[r, nc] == OBST:
+                    continue
+                cost = math.sqrt(2.0)
+            else:
+                cost = 1.0
+            v = nr * cols + nc
+            if status[v] == CLOSED:
+                continue
+            alt = g[u] + cost
+            if heuristic:
+                dxh = tc - nc
+                dyh = tr - nr
+                if diagonal:
+                    f = alt + math.sqrt(dxh * dxh + dyh * dyh)
+                else:
+                    f = alt + abs(dxh) + abs(dyh)
+            else:
+                f = alt
+            if f < f_score[v]:
+                g[v] = alt
+                f_score[v] = f
+                parents[v] = u
+                status[v] = OPEN
+                size = _heap_push(heap_f, heap_seq, heap_idx, size, f, seq, v)
+                seq += 1
+    return parents, status, expanded, found
+
+
+@njit(cache=True)
+def astar_grid(grid, sr, sc, tr, tc, diagonal):
+    """
+    A* search of the grid (Euclidean heuristic with diagonal movements, Manhattan without)
+
+    :return: see _search()
+    """
+    return _search(grid, sr, sc, tr, tc, diagonal, True)
+
+
+@njit(cache=True)
+def dijkstra_grid(grid, sr, sc, tr, tc, diagonal):
+    """
+    Dijkstra's search of the grid
+
+    :return: see _search()
+    """
+    return _search(grid, sr, sc, tr, tc, diagonal, False)
+
+
+@njit(cache=True)
+def _traverse(grid, sr, sc, tr, tc, diagonal, depth_first):
+    """
+    Uninformed search of the grid from (sr, sc) to (tr, tc), expanding the cells in the order
+    of Maze51.expand_node(): the successors already in the OPEN SET or the CLOSED SET are skipped
+
+    :param grid:        the grid, as a 2-D numpy array
+    :param sr:          the row of the initial position of the robot
+    :param sc:          the column of the initial position of the robot
+    :param tr:          the row of the target
+    :param tc:          the column of the target
+    :param diagonal:    flag that indicates that diagonal movements are allowed
+    :param depth_first: True for DFS (the OPEN SET is a stack), False for BFS (a queue)
+    :return:            see _search()
+    """
+    rows, cols = grid.shape
+    n = rows * cols
+    parents = numpy.full(n, -1, numpy.int32)
+    status = numpy.zeros(n, numpy.uint8)
+    # every cell enters the OPEN SET at most once
+    open_set = numpy.empty(n, numpy.int32)
+    successors = numpy.empty(8, numpy.int32)
+    head = 0
+    tail = 1
+    open_set[0] = sr * cols + sc
+    status[open_set[0]] = OPEN
+    target = tr * cols + tc
+    expanded = 0
+    found = False
+    step = 1 if diagonal else 2
+    while tail > head:
+        if depth_first:
+            tail -= 1
+            u = open_set[tail]
+        else:
+            u = open_set[head]
+            head += 1
+        status[u] = CLOSED
+        if u == target:
+            found = True
+            break
+        expanded += 1
+        r = u // cols
+        c = u - r * cols
+        count = 0
+        for k in range(0, 8, step):
+            dr = NEIGHBOR_ROWS[k]
+            dc = NEIGHBOR_COLS[k]
+            nr = r + dr
+            nc = c + dc
+            if nr < 0 or nr >= rows or nc < 0 or nc >= cols or grid[nr, nc] == OBST:
+                continue
+            # it is not reasonable to allow the robot to pass through a "slot"
+            if dr != 0 and dc != 0 and grid[nr, c] == OBST and grid[r, nc] == OBST:
+                continue
+            v = nr * cols + nc
+            if status[v] != UNSEEN:
+                continue
+            successors[count] = v
+            count += 1
+        for i in range(count):
+            # DFS pushes the successors in reverse order, so that the one of the highest priority is on top
+            v = successors[count - 1 - i] if depth_first else successors[i]
+            parents[v] = u
+            status[v] = OPEN
+            open_set[tail] = v
+            tail += 1
+    return parents, status, expanded, found
+
+
+@njit(cache=True)
+def bfs_grid(grid, sr, sc, tr, tc, diagonal):
+    """
+    BFS of the grid
+
+    :return: see _search()
+    """
+    return _traverse(grid, sr, sc, tr, tc, diagonal, False)
+
+
+@njit(cache=True)
+def dfs_grid(grid, sr, sc, tr, tc, diagonal):
+    """
+    DFS of the grid
+
+    :return: see _search()
+    """
+    return _traverse(grid, sr, sc, tr, tc, diagonal, True)
+
+
+@njit(cache=True)
+def generate_maze(is_open, connect_down, connect_right, seed):
+    """
+    Generates a random perfect maze, as MyMaze.generate_maze() does
+
+    :param is_open:       the cells that have yet to be used in generation (all True on entry)
+    :param connect_down:  set where a cell is connected to the cell below it
+    :param connect_right: set where a cell is connected to the cell at its right
+    :param seed:          the seed of the random numbers
+    """
+    numpy.random.seed(seed)
+    dimension_x, dimension_y = is_open.shape
+    # Every pop is followed by at most two pushes, one of them a cell never pushed before.
+    stack = numpy.empty((dimension_x * dimension_y + 1, 2), numpy.int32)
+    neighbors = numpy.empty((4, 2), numpy.int32)
+    is_open[0, 0] = False
+    stack[0, 0] = 0
+    stack[0, 1] = 0
+    top = 1
+    while top > 0:
+        # reduce the number of long twisting halls with short easy to detect branches
+        if numpy.random.randint(0, 10) == 0:
+            i = numpy.random.randint(0, top)
+            for k in range(2):
+                temp = stack[i, k]
+                stack[i, k] = stack[top - 1, k]
+                stack[top - 1, k] = temp
+        top -= 1
+        x = stack[top, 0]
+        y = stack[top, 1]
+        count = 0
+        for k in range(4):
+            other_x = x + MAZE_DX[k]
+            other_y = y + MAZE_DY[k]
+            if 0 <= other_x < dimension_x and 0 <= other_y < dimension_y and is_open[other_x, other_y]:
+                neighbors[count, 0] = other_x
+                neighbors[count, 1] = other_y
+                count += 1
+        if count == 0:
+            continue
+        k = numpy.random.randint(0, count)
+        selected_x = neighbors[k, 0]
+        selected_y = neighbors[k, 1]
+        is_open[selected_x, selected_y] = False
+        # the connection is kept by the upper left one of the two cells
+        if selected_x == x:
+            connect_down[x, min(y, selected_y)] = True
+        else:
+            connect_right[min(x, selected_x), y] = True
+        stack[top, 0] = x
+        stack[top, 1] = y
+        stack[top + 1, 0] = selected_x
+        stack[top + 1, 1] = selected_y
+        top += 2